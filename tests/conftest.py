@@ -10,7 +10,6 @@ import requests
 from faker import Faker
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from playwright.sync_api import sync_playwright, Browser, Page
 
 from app.database import Base, get_engine, get_sessionmaker
 from app.models.user import User
@@ -86,12 +85,19 @@ class ServerStartupError(Exception):
 # ======================================================================================
 # Database Fixtures
 # ======================================================================================
-@pytest.fixture(scope="session", autouse=True)
-def setup_test_database(request):
+def _is_xdist_worker(config) -> bool:
+    """Return True when running inside a pytest-xdist worker process."""
+    return hasattr(config, "workerinput")
+
+def pytest_sessionstart(session):
     """
-    Set up the test database before the session starts, and tear it down after tests
-    unless --preserve-db is provided.
+    Set up the test database before the session starts. With pytest-xdist this
+    runs once on the controller, before any workers are spawned, so parallel
+    workers never drop tables out from under each other.
     """
+    if _is_xdist_worker(session.config) or session.config.option.collectonly:
+        return
+
     logger.info("Setting up test database...")
     try:
         Base.metadata.drop_all(bind=test_engine)
@@ -102,9 +108,15 @@ def setup_test_database(request):
         logger.error(f"Error setting up test database: {str(e)}")
         raise
 
-    yield  # Tests run after this
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Tear down the test database after all tests (and all xdist workers) have
+    finished, unless --preserve-db is provided.
+    """
+    if _is_xdist_worker(session.config) or session.config.option.collectonly:
+        return
 
-    if not request.config.getoption("--preserve-db"):
+    if not session.config.getoption("--preserve-db"):
         logger.info("Dropping test database tables...")
         drop_db()
 
@@ -168,20 +180,25 @@ def find_available_port() -> int:
         return s.getsockname()[1]
 
 @pytest.fixture(scope="session")
-def fastapi_server():
+def fastapi_server(request):
     """
     Start a FastAPI test server in a subprocess. If the chosen port (default: 8000)
     is already in use, find another available port. Wait until the server is up
     before yielding its base URL.
+
+    Each pytest-xdist worker starts its own server on a free port, so workers
+    never race for port 8000.
     """
     base_port = 8000
-    server_url = f'http://127.0.0.1:{base_port}/'
 
-    # Check if port is free; if not, pick an available port
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        if s.connect_ex(('127.0.0.1', base_port)) == 0:
-            base_port = find_available_port()
-            server_url = f'http://127.0.0.1:{base_port}/'
+    if _is_xdist_worker(request.config):
+        base_port = find_available_port()
+    else:
+        # Check if port is free; if not, pick an available port
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            if s.connect_ex(('127.0.0.1', base_port)) == 0:
+                base_port = find_available_port()
+    server_url = f'http://127.0.0.1:{base_port}/'
 
     logger.info(f"Starting FastAPI server on port {base_port}...")
 
@@ -213,43 +230,6 @@ def fastapi_server():
         process.kill()
         logger.warning("Test server forcefully stopped.")
 
-# ======================================================================================
-# Playwright Fixtures for UI Testing
-# ======================================================================================
-@pytest.fixture(scope="session")
-def browser_context():
-    """Provide a Playwright browser context for UI tests (session-scoped)."""
-    with sync_playwright() as playwright:
-        browser = playwright.chromium.launch(
-            headless=True,
-            args=['--no-sandbox', '--disable-dev-shm-usage']
-        )
-        logger.info("Playwright browser launched.")
-        try:
-            yield browser
-        finally:
-            logger.info("Closing Playwright browser.")
-            browser.close()
-
-@pytest.fixture
-def page(browser_context: Browser):
-    """
-    Provide a new browser page for each test, with a standard viewport.
-    Closes the page and context after each test.
-    """
-    context = browser_context.new_context(
-        viewport={'width': 1920, 'height': 1080},
-        ignore_https_errors=True
-    )
-    page = context.new_page()
-    logger.info("New browser page created.")
-    try:
-        yield page
-    finally:
-        logger.info("Closing browser page and context.")
-        page.close()
-        context.close()
-
 # ======================================================================================
 # Pytest Command-Line Options
 # ======================================================================================
@@ -258,9 +238,12 @@ def pytest_addoption(parser):
     Add custom command line options:
       --preserve-db : Keep test database after tests
       --run-slow    : Run tests marked as 'slow'
+      --trace-on-failure : Record Playwright traces and keep them for failed e2e tests
     """
     parser.addoption("--preserve-db", action="store_true", help="Keep test database after tests")
     parser.addoption("--run-slow", action="store_true", help="Run tests marked as slow")
+    parser.addoption("--trace-on-failure", action="store_true",
+                     help="Record Playwright traces and keep them for failed e2e tests")
 
 def pytest_collection_modifyitems(config, items):
     """
@@ -0,0 +1,335 @@
+import json
+import logging
+import re
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, Generator
+from uuid import uuid4
+
+import pytest
+import requests
+from playwright.sync_api import sync_playwright, Playwright, Browser, BrowserContext, Page, expect
+from playwright.sync_api import Error as PlaywrightError
+
+logger = logging.getLogger(__name__)
+
+# ======================================================================================
+# Playwright Configuration
+# ======================================================================================
+# Auto-retrying assertions poll for up to this long before failing, so tests wait
+# on the element they need instead of sleeping for a fixed amount of time.
+expect.set_options(timeout=5000)
+
+# Chromium flags for headless CI runs: write shared memory to /tmp instead of the
+# (often tiny) container /dev/shm, and skip GPU, extension and first-run start-up work
+CHROMIUM_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-extensions',
+    '--no-first-run',
+    '--disable-background-networking',
+]
+
+# Options shared by every browser context the fixtures create
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1920, 'height': 1080},
+    'ignore_https_errors': True,
+}
+
+# Where traces of failed tests are written when running with --trace-on-failure
+TRACE_DIR = Path("test-results") / "traces"
+
+# Init script used by restore_auth(): copies a storage state's localStorage
+# entries for the current origin, once per tab (tracked in sessionStorage)
+RESTORE_AUTH_SCRIPT = """
+(() => {
+    const origin = __ORIGINS__.find(o => o.origin === location.origin);
+    if (!origin || sessionStorage.getItem('e2e_auth_restored')) return;
+    for (const { name, value } of origin.localStorage) {
+        localStorage.setItem(name, value);
+    }
+    sessionStorage.setItem('e2e_auth_restored', 'true');
+})();
+"""
+
+# Static assets that tests never assert on (served locally or by font/CDN hosts)
+BLOCKED_ASSET_PATTERNS = [
+    "**/*.{png,jpg,jpeg,svg,gif,ico,woff,woff2,css}",
+    "https://fonts.googleapis.com/**",
+    "https://fonts.gstatic.com/**",
+]
+
+# ======================================================================================
+# Helper Functions
+# ======================================================================================
+def block_static_assets(context: BrowserContext) -> None:
+    """
+    Abort stylesheet, font and image requests that no test asserts on, so page
+    loads don't wait on them. Scripts are left alone: the Tailwind browser build
+    drives the `hidden` class that our visibility assertions depend on.
+    """
+    for pattern in BLOCKED_ASSET_PATTERNS:
+        context.route(pattern, lambda route: route.abort())
+
+def register_user_via_api(fastapi_server: str, first_name: str, last_name: str, username: str) -> Dict[str, str]:
+    """
+    Register a user (with email <username>@example.com) through the JSON API
+    and return the submitted user data (including the plain-text password).
+    """
+    user_data = {
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": f"{username}@example.com",
+        "username": username,
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    response = requests.post(f"{fastapi_server}auth/register", json=user_data)
+    assert response.status_code == 201, f"User registration failed: {response.text}"
+    return user_data
+
+def login_via_api(fastapi_server: str, user_data: Dict[str, str]) -> Dict[str, str]:
+    """Log a user in through the JSON API and return the token response data."""
+    login_payload = {
+        "username": user_data["username"],
+        "password": user_data["password"]
+    }
+    response = requests.post(f"{fastapi_server}auth/login", json=login_payload)
+    assert response.status_code == 200, f"Login failed: {response.text}"
+    return response.json()
+
+def auth_storage_state(home_url: str, token_data: Dict[str, str]) -> Dict:
+    """
+    Build a Playwright storage state holding the same localStorage entries the
+    login page writes after a successful login (see storeTokens in login.html).
+    """
+    local_storage = {
+        "access_token": token_data["access_token"],
+        "refresh_token": token_data["refresh_token"],
+        "token_expires": token_data["expires_at"],
+        "user_id": token_data["user_id"],
+        "username": token_data["username"],
+    }
+    return {
+        "cookies": [],
+        "origins": [{
+            "origin": home_url.rstrip("/"),
+            "localStorage": [{"name": name, "value": str(value)} for name, value in local_storage.items()],
+        }],
+    }
+
+def new_context(browser: Browser, config=None, **options) -> BrowserContext:
+    """
+    Create a browser context with the standard options and static assets
+    blocked. When a pytest config is given and --trace-on-failure is set, the
+    context also starts tracing (see start_trace_chunk/stop_trace_chunk).
+    """
+    context = browser.new_context(**CONTEXT_OPTIONS, **options)
+    block_static_assets(context)
+    if config is not None and config.getoption("--trace-on-failure"):
+        context.tracing.start(screenshots=True, snapshots=True)
+    return context
+
+def start_trace_chunk(context: BrowserContext, request) -> None:
+    """Start a fresh trace chunk for the test when running with --trace-on-failure."""
+    if request.config.getoption("--trace-on-failure"):
+        context.tracing.start_chunk()
+
+def stop_trace_chunk(context: BrowserContext, request) -> None:
+    """
+    End the test's trace chunk. It is written to TRACE_DIR only when the test
+    failed and discarded otherwise.
+    """
+    if request.config.getoption("--trace-on-failure"):
+        reports = (getattr(request.node, f"rep_{when}", None) for when in ("setup", "call"))
+        if any(report is not None and report.failed for report in reports):
+            trace_name = re.sub(r'[^\w.-]+', '_', request.node.nodeid)
+            trace_path = TRACE_DIR / f"{trace_name}.zip"
+            context.tracing.stop_chunk(path=trace_path)
+            logger.info(f"Saved Playwright trace to {trace_path}.")
+        else:
+            context.tracing.stop_chunk()
+
+def restore_auth(page: Page, storage_state) -> None:
+    """
+    Log the page in by restoring the localStorage entries from a storage state
+    (a dict or a path to a JSON file) before the app's scripts first run. The
+    entries are written once per page, so a test can still log out.
+    """
+    if not isinstance(storage_state, dict):
+        storage_state = json.loads(Path(storage_state).read_text())
+    page.add_init_script(RESTORE_AUTH_SCRIPT.replace("__ORIGINS__", json.dumps(storage_state["origins"])))
+
+def clear_local_storage(page: Page, urls: SimpleNamespace) -> None:
+    """
+    Wipe the app's localStorage, where the JWT lives. clear_cookies() does not
+    touch it, so the shared context would otherwise stay logged in.
+    """
+    if not page.url.startswith(urls.home):
+        return  # the page never loaded the app, so it stored nothing
+    try:
+        page.evaluate("() => localStorage.clear()")
+    except PlaywrightError:
+        # The page was mid-navigation when the test ended; load the app to clear it
+        page.goto(urls.home)
+        page.evaluate("() => localStorage.clear()")
+
+# ======================================================================================
+# Pytest Hooks
+# ======================================================================================
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Attach each phase's report to the test item (as rep_setup, rep_call, ...)
+    so fixtures can tell during teardown whether the test failed.
+    """
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+# ======================================================================================
+# Playwright Fixtures for UI Testing
+# ======================================================================================
+@pytest.fixture(scope="session")
+def playwright() -> Generator[Playwright, None, None]:
+    """Start the Playwright driver once for the whole test session."""
+    with sync_playwright() as p:
+        yield p
+
+@pytest.fixture(scope="session")
+def browser(playwright: Playwright) -> Generator[Browser, None, None]:
+    """
+    Launch a single Chromium instance that is shared by every UI test in the
+    session, so we only pay the browser start-up cost once.
+    """
+    browser = playwright.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+    logger.info("Playwright browser launched.")
+    try:
+        yield browser
+    finally:
+        logger.info("Closing Playwright browser.")
+        browser.close()
+
+@pytest.fixture(scope="session")
+def context(browser: Browser, pytestconfig) -> Generator[BrowserContext, None, None]:
+    """
+    Provide one browser context, with a standard viewport, shared by every test
+    in the session (i.e. per xdist worker). Reusing it is cheaper than creating
+    a context per test; the page fixture wipes cookies, permissions and
+    localStorage after each test so tests stay isolated.
+    """
+    context = new_context(browser, pytestconfig)
+    try:
+        yield context
+    finally:
+        logger.info("Closing browser context.")
+        context.close()
+
+@pytest.fixture
+def teardown_checks(browser: Browser, context: BrowserContext) -> Generator[None, None, None]:
+    """
+    Close any page or extra browser context still open after a test, e.g. when
+    a fixture raised before reaching its own cleanup, so nothing leaks into the
+    next test. The page fixture depends on this, so it tears down last.
+    """
+    yield
+    for leftover in context.pages:
+        logger.warning("Closing browser page left open after the test.")
+        leftover.close()
+    for leftover in browser.contexts:
+        if leftover is not context:
+            logger.warning("Closing browser context left open after the test.")
+            leftover.close()
+
+@pytest.fixture
+def page(context: BrowserContext, urls: SimpleNamespace, request, teardown_checks) -> Generator[Page, None, None]:
+    """
+    Provide a new browser page in the shared context, then reset the context's
+    cookies, permissions and the app's localStorage once the test is done.
+    """
+    start_trace_chunk(context, request)
+    page = context.new_page()
+    logger.info("New browser page created.")
+    try:
+        yield page
+    finally:
+        logger.info("Closing browser page and clearing its state.")
+        try:
+            clear_local_storage(page, urls)
+        finally:
+            page.close()
+            context.clear_cookies()
+            context.clear_permissions()
+            stop_trace_chunk(context, request)
+
+# ======================================================================================
+# URL Fixtures
+# ======================================================================================
+@pytest.fixture(scope="session")
+def urls(fastapi_server: str) -> SimpleNamespace:
+    """
+    Provide the app's page and API URLs, built once from the test server's base
+    URL. A typo in a test (e.g. urls.dashbaord) fails with an AttributeError.
+    """
+    return SimpleNamespace(
+        home=fastapi_server,
+        login=f"{fastapi_server}login",
+        register=f"{fastapi_server}register",
+        dashboard=f"{fastapi_server}dashboard",
+        calculations=f"{fastapi_server}calculations",
+    )
+
+# ======================================================================================
+# Test User Fixtures
+# ======================================================================================
+@pytest.fixture(scope="session")
+def unique_user(worker_id: str) -> Callable[[str], str]:
+    """
+    Provide a function that turns a base name into a username that is unique
+    across pytest-xdist workers and runs, e.g. 'calctester_gw1_3f9a2c'.
+    worker_id is 'master' when the tests are not running under xdist.
+    """
+    return lambda base: f"{base}_{worker_id}_{uuid4().hex[:6]}"
+
+@pytest.fixture(scope="session")
+def registered_user(fastapi_server: str, unique_user: Callable[[str], str]) -> Dict[str, str]:
+    """
+    Register a seed user once per session through the JSON API, for tests that
+    need an account to already exist (e.g. duplicate-email validation or login).
+    """
+    user_data = register_user_via_api(fastapi_server, "Seed", "User", unique_user("seeduser"))
+    logger.info(f"Registered seed user {user_data['username']}.")
+    return user_data
+
+@pytest.fixture(scope="session")
+def authenticated_state(browser: Browser, fastapi_server: str, urls: SimpleNamespace,
+                        unique_user: Callable[[str], str], tmp_path_factory) -> Path:
+    """
+    Log in one shared user through the API, load the dashboard with its tokens,
+    and save the resulting browser storage state to a JSON file. This happens
+    once per session (i.e. once per xdist worker, since each worker gets its
+    own temp directory), and every authenticated page is restored from it.
+    """
+    user_data = register_user_via_api(fastapi_server, "Auth", "Tester", unique_user("authtester"))
+    token_data = login_via_api(fastapi_server, user_data)
+    context = new_context(browser, storage_state=auth_storage_state(urls.home, token_data))
+    try:
+        page = context.new_page()
+        page.goto(urls.dashboard)
+        state_file = tmp_path_factory.mktemp("auth") / "state.json"
+        context.storage_state(path=state_file)
+        logger.info(f"Saved authenticated storage state to {state_file}.")
+    finally:
+        context.close()
+    return state_file
+
+@pytest.fixture
+def authenticated_page(page: Page, authenticated_state: Path, urls: SimpleNamespace) -> Page:
+    """
+    Provide a page that is already logged in as the shared session user,
+    opened on the dashboard. Calculations from other tests may be listed too.
+    """
+    restore_auth(page, authenticated_state)
+    page.goto(urls.dashboard)
+    return page